@@ -1,13 +1,49 @@
 import argparse
+import hashlib
+import io
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 import numpy as np
 from astropy.coordinates import SkyCoord
-from astropy.table import vstack
-from romanisim.catalog import make_cosmos_galaxies, make_gaia_stars, make_stars
+from astropy.table import Table, vstack
 
-from roman_simulate_dr.scripts.logger import logger
+from roman_simulate_dr.scripts.logger import logger, set_verbosity
 from roman_simulate_dr.scripts.utils import generate_catalog_name, read_obs_plan
 
+_COMPONENT_NAMES = ("galaxies", "gaia_stars", "stars")
+
+# ensures ROMAN_CAT_CACHE=clear wipes the cache only once per process
+_cache_cleared = False
+
+
+def _component_cache_dir() -> Path:
+    """
+    Resolve the on-disk cache directory for component catalogs.
+
+    The location can be overridden with the ``ROMAN_CAT_CACHE``
+    environment variable; the special value "clear" wipes the default
+    cache before returning it.
+
+    Returns
+    -------
+    pathlib.Path
+        The cache directory (created if necessary).
+    """
+    global _cache_cleared
+    env = os.environ.get("ROMAN_CAT_CACHE")
+    cache_dir = Path.home() / ".cache" / "roman_simulate_dr"
+    if env == "clear":
+        if not _cache_cleared:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            _cache_cleared = True
+    elif env:
+        cache_dir = Path(env)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
 
 class InputCatalog:
     """
@@ -21,6 +57,9 @@ class InputCatalog:
         ra: float | None = None,
         dec: float | None = None,
         radius: float | None = None,
+        output_format: str = "parquet",
+        match_radius: float | None = None,
+        tiled: bool = False,
     ):
         """
         Initialize the InputCatalog object.
@@ -37,25 +76,542 @@ class InputCatalog:
             Override for the Dec (deg) of the whole catalog.
         radius : float or None, optional
             Override for the radius (deg) of the whole catalog.
+        output_format : str, optional
+            Format of the final catalog (default "parquet"). "ascii.ecsv"
+            is available for small, human-readable debug dumps.
+        match_radius : float or None, optional
+            If set, suppress near-duplicate sources within this separation
+            (arcsec) in the final catalog, in addition to the exact
+            coincidence dedup.
+        tiled : bool, optional
+            If True, decompose the field into smaller overlapping
+            sub-cones and query them concurrently instead of issuing one
+            monolithic cone search per component; useful for radii large
+            enough to hit server-side query limits.
         """
         self.plan = read_obs_plan(obs_plan_filename)
         if output_catalog_filename is not None:
             self.catalog_filename = output_catalog_filename
         else:
-            self.catalog_filename = generate_catalog_name(obs_plan_filename)
+            # the extension must reflect what is actually written:
+            # romanisim and astropy pick their reader from it, and a
+            # Parquet payload under a .ecsv name forces a failed ASCII
+            # parse before anything useful happens
+            self.catalog_filename = generate_catalog_name(
+                obs_plan_filename,
+                ext=".parquet" if output_format == "parquet" else ".ecsv",
+            )
+
+        # set reference coordinates and radius to simulate; defaults come
+        # from the bounding circle of the plan pointings so the generated
+        # catalog actually covers every visit, not just their centroid
+        if ra is None or dec is None or radius is None:
+            plan_ra, plan_dec, plan_radius = self._plan_field(self.plan)
+        self.ra = ra if ra is not None else plan_ra
+        self.dec = dec if dec is not None else plan_dec
+        self.radius = radius if radius is not None else plan_radius
+        self.output_format = output_format
+        self.match_radius = match_radius
+        self.tiled = tiled
+
+        # normalize the plan once at parse time: the canonical uppercase
+        # bandpass tuple the plan actually uses (order-preserving, deduped,
+        # hashable), or None to fall back to the default set
+        self.bandpasses = (
+            tuple(dict.fromkeys(str(bp).upper() for bp in self.plan["BANDPASS"]))
+            if "BANDPASS" in self.plan
+            else None
+        )
+
+        # build the reference SkyCoord once; SkyCoord construction carries
+        # non-trivial frame-resolution overhead that should not be repaid
+        # on every catalog-generation call
+        self.coords = SkyCoord(ra=self.ra, dec=self.dec, unit="deg", frame="icrs")
+
+        # populated by _generate_catalog; lets callers reuse the catalog
+        # without re-reading the file that was written to disk
+        self.catalog = None
+
+        # memoizes the romanisim make_* results per field definition so
+        # repeated generation requests do not recompute them
+        self._component_cache = {}
+
+    @staticmethod
+    def _plan_field(plan):
+        """
+        Derive the bounding circle of a plan's pointings.
+
+        Pure unit-vector math: the center is the normalized mean of the
+        pointing unit vectors, the radius is the largest angular distance
+        from that center plus a 0.3 deg margin for the WFI footprint.
+        No astropy frame machinery is needed for either.
+
+        Parameters
+        ----------
+        plan : astropy.table.Table or mapping
+            Plan with `RA` and `DEC` columns in degrees.
 
-        # set reference coordinates and radius to simulate
-        self.ra = (
-            ra
-            if ra is not None
-            else float(np.mean(np.array(self.plan["RA"])))
+        Returns
+        -------
+        tuple of float
+            (ra, dec, radius) of the bounding circle, in degrees.
+        """
+        ra_r = np.deg2rad(np.asarray(plan["RA"], dtype=np.float64))
+        dec_r = np.deg2rad(np.asarray(plan["DEC"], dtype=np.float64))
+        cos_dec = np.cos(dec_r)
+        x = cos_dec * np.cos(ra_r)
+        y = cos_dec * np.sin(ra_r)
+        z = np.sin(dec_r)
+        mean = np.array([x.mean(), y.mean(), z.mean()])
+        mean /= np.linalg.norm(mean)
+        dots = np.clip(x * mean[0] + y * mean[1] + z * mean[2], -1.0, 1.0)
+        return (
+            float(np.rad2deg(np.arctan2(mean[1], mean[0])) % 360.0),
+            float(np.rad2deg(np.arcsin(mean[2]))),
+            float(np.rad2deg(np.arccos(dots.min())) + 0.3),
         )
-        self.dec = (
-            dec
-            if dec is not None
-            else float(np.mean(np.array(self.plan["DEC"])))
+
+    @staticmethod
+    def _stack_components(tables):
+        """
+        Concatenate component catalogs into a single Table.
+
+        Columns are preallocated once at the total row count and filled by
+        slice assignment, avoiding the extra full-size copy that `vstack`
+        makes while concatenating. Tables with diverging schemas fall back
+        to `vstack`, which knows how to promote and mask columns.
+
+        Parameters
+        ----------
+        tables : list of astropy.table.Table
+            The component catalogs to concatenate.
+
+        Returns
+        -------
+        astropy.table.Table
+            The concatenated catalog.
+        """
+        tables = [t for t in tables if len(t) > 0]
+        if not tables:
+            return Table()
+        colnames = tables[0].colnames
+        if any(t.colnames != colnames for t in tables[1:]):
+            return vstack(tables)
+        n_total = sum(len(t) for t in tables)
+        columns = {}
+        for name in colnames:
+            # promote across all inputs: allocating at the first table's
+            # dtype would silently truncate wider strings and downcast
+            # wider floats from the later tables
+            dtype = np.result_type(*(t[name].dtype for t in tables))
+            out = np.empty(n_total, dtype=dtype)
+            offset = 0
+            for t in tables:
+                out[offset : offset + len(t)] = t[name]
+                offset += len(t)
+            columns[name] = out
+        return Table(columns, copy=False)
+
+    @staticmethod
+    def _deduplicate(catalog, match_radius: float | None = None):
+        """
+        Remove rows with duplicated (ra, dec) coordinates from a catalog.
+
+        Duplicates can occur where the component catalogs (e.g. Gaia stars
+        and synthetic stars) overlap on the sky. By default coordinates are
+        quantized to ~1 mas and packed into a single integer key, so
+        equivalent positions match regardless of RA wrap-around
+        (0/360 deg). With `match_radius` set, a KD-tree
+        crossmatch suppresses near-duplicates within that separation
+        instead of requiring exact coincidence.
+
+        Parameters
+        ----------
+        catalog : astropy.table.Table
+            The catalog to deduplicate.
+        match_radius : float or None, optional
+            Separation in arcsec below which two sources count as the same
+            object. If None (default), only exactly coincident positions
+            are collapsed.
+
+        Returns
+        -------
+        astropy.table.Table
+            The catalog with only the first occurrence of each coordinate.
+        """
+        if match_radius is not None and len(catalog) > 1:
+            import astropy.units as u
+
+            coords = SkyCoord(
+                ra=np.asarray(catalog["ra"], dtype=np.float64),
+                dec=np.asarray(catalog["dec"], dtype=np.float64),
+                unit="deg",
+                frame="icrs",
+            )
+            idx, sep, _ = coords.match_to_catalog_sky(coords, nthneighbor=2)
+            close = sep < match_radius * u.arcsec
+            # of each close pair, keep the lower-index (first-seen) member
+            rows = np.arange(len(catalog))
+            return catalog[~close | (rows < idx)]
+        # lazy import: pandas (like pyarrow below) is only needed once
+        # real catalogs flow through, not to print --help or validate
+        # arguments
+        import pandas as pd
+
+        keys = InputCatalog._coordinate_keys(catalog)
+        # hash-based duplicate detection (amortized O(1) per row) rather
+        # than np.unique's O(N log N) sort; keeps first occurrences and
+        # yields a boolean mask so each column takes the contiguous-copy
+        # path instead of a per-element gather
+        mask = ~pd.Series(keys).duplicated().to_numpy()
+        return catalog[mask]
+
+    @staticmethod
+    def _coordinate_keys(catalog):
+        """
+        Pack each row's position into a single 64-bit dedup key.
+
+        RA (wrapped to [0, 360)) and Dec (offset to non-negative) are
+        quantized to milliarcseconds — 31 and 30 bits respectively — and
+        packed as ``ra << 32 | dec``. One flat uint64 per row moves a
+        third of the bytes of the previous three-component unit-vector
+        key through the hash table, and the quantization makes dedup
+        deterministic under float round-trips through text formats.
+
+        Parameters
+        ----------
+        catalog : astropy.table.Table
+            Catalog with `ra` and `dec` columns in degrees.
+
+        Returns
+        -------
+        numpy.ndarray
+            Flat uint64 array; equal keys mean coincident positions to
+            ~1 mas.
+        """
+        mas_per_deg = 3.6e6
+        full_circle = np.uint64(360 * 3_600_000)
+        ra_i = np.rint(
+            (np.asarray(catalog["ra"], dtype=np.float64) % 360.0) * mas_per_deg
+        ).astype(np.uint64)
+        # 360 deg rounds up to the same key as 0 deg
+        ra_i %= full_circle
+        dec_i = np.rint(
+            (np.asarray(catalog["dec"], dtype=np.float64) + 90.0) * mas_per_deg
+        ).astype(np.uint64)
+        return (ra_i << np.uint64(32)) | dec_i
+
+    @classmethod
+    def _deduplicate_components(cls, tables):
+        """
+        Remove duplicated positions within and across component catalogs.
+
+        Filtering each component before concatenation means the subsequent
+        stack only ever copies rows that survive, instead of concatenating
+        everything and discarding the duplicates afterwards.
+
+        Parameters
+        ----------
+        tables : list of astropy.table.Table
+            The component catalogs, in priority order: a position seen in
+            an earlier table wins over later occurrences.
+
+        Returns
+        -------
+        list of astropy.table.Table
+            The components with only globally-unique positions retained.
+        """
+        import pandas as pd
+
+        seen = None
+        unique_tables = []
+        for t in tables:
+            if len(t) == 0:
+                unique_tables.append(t)
+                continue
+            keys = cls._coordinate_keys(t)
+            mask = ~pd.Series(keys).duplicated().to_numpy()
+            if seen is not None:
+                mask &= ~np.isin(keys, seen)
+            unique_tables.append(t[mask])
+            kept = keys[mask]
+            seen = kept if seen is None else np.concatenate([seen, kept])
+        return unique_tables
+
+    def _write_catalog(self, catalog, row_group_size: int = 256_000):
+        """
+        Write the catalog to the output Parquet file via pyarrow.
+
+        The whole table is wrapped in an Arrow table in one step: for
+        numeric columns Arrow adopts the existing numpy buffers without
+        copying, so this is cheaper than slicing the astropy table into
+        chunks (each slice is a full copy). pyarrow splits the output
+        into bounded row groups itself, written with ZSTD compression and
+        dictionary encoding, which roughly halves the file size of the
+        default SNAPPY layout on catalog data.
+
+        Parameters
+        ----------
+        catalog : astropy.table.Table
+            The catalog to write.
+        row_group_size : int, optional
+            Maximum number of rows per Parquet row group (default 256000).
+        """
+        # write to a sibling temporary file and rename it over the final
+        # name only once complete: a crash or kill mid-write leaves the
+        # previous catalog intact instead of a truncated file that the
+        # simulation step would happily consume
+        final_path = Path(self.catalog_filename)
+        tmp_path = final_path.with_name(final_path.name + ".tmp")
+        try:
+            if self.output_format != "parquet":
+                if self.output_format.startswith("ascii"):
+                    # assemble the whole ASCII rendering in memory and flush
+                    # it with one write: astropy's ASCII writers emit many
+                    # tiny writes, a known slow path on networked filesystems
+                    # (Lustre/GPFS), where per-write latency dominates
+                    buffer = io.StringIO()
+                    catalog.write(buffer, format=self.output_format)
+                    tmp_path.write_text(buffer.getvalue())
+                else:
+                    # other debug/interchange formats go through astropy's
+                    # writers
+                    catalog.write(
+                        str(tmp_path), format=self.output_format, overwrite=True
+                    )
+            else:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+
+                data = pa.Table.from_pydict(
+                    {name: np.asarray(catalog[name]) for name in catalog.colnames}
+                )
+                pq.write_table(
+                    data,
+                    str(tmp_path),
+                    row_group_size=row_group_size,
+                    compression="zstd",
+                    compression_level=3,
+                    use_dictionary=True,
+                    write_statistics=True,
+                )
+            tmp_path.replace(final_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    def _make_components(self, bandpasses: tuple):
+        """
+        Generate (or fetch memoized) component catalogs for this field.
+
+        The romanisim ``make_*`` calls dominate the runtime of catalog
+        generation and are deterministic for a fixed field definition, so
+        the results are cached on the instance keyed by
+        (ra, dec, radius, bandpasses).
+
+        Parameters
+        ----------
+        bandpasses : tuple of str
+            Uppercase bandpass names (hashable, for the cache key).
+
+        Returns
+        -------
+        tuple of astropy.table.Table
+            The galaxy, Gaia star, and synthetic star catalogs.
+        """
+        key = (
+            round(self.ra, 6),
+            round(self.dec, 6),
+            round(self.radius, 6),
+            bandpasses,
+            self.tiled,
         )
-        self.radius = radius if radius is not None else 0.3
+        if key not in self._component_cache:
+            components = self._read_cached_components(key)
+            if components is None:
+                # lazy import: romanisim pulls in galsim and stpsf (seconds
+                # of import time), which --help, argument validation, and
+                # cache hits should not have to pay for
+                from romanisim.catalog import (
+                    make_cosmos_galaxies,
+                    make_gaia_stars,
+                    make_stars,
+                )
+
+                tiles = (
+                    self._tile_field()
+                    if self.tiled
+                    else [(self.ra, self.dec, self.radius)]
+                )
+                # spread the synthetic-star budget over the tiles so the
+                # tiled and monolithic paths produce comparable densities
+                n_stars = max(1, 1000 // len(tiles))
+                # the generators are independent and spend most of their
+                # time in I/O (COSMOS table reads, Gaia cone search), so
+                # run them concurrently — across components and, when
+                # tiling, across tiles: wall time approaches the slowest
+                # single query instead of the sum of all of them
+                gal_futures, gaia_futures, star_futures = [], [], []
+                with ThreadPoolExecutor(
+                    max_workers=min(8, 3 * len(tiles))
+                ) as executor:
+                    for ra, dec, tile_radius in tiles:
+                        coord = (
+                            self.coords
+                            if (ra, dec) == (self.ra, self.dec)
+                            else SkyCoord(
+                                ra=ra, dec=dec, unit="deg", frame="icrs"
+                            )
+                        )
+                        gal_futures.append(
+                            executor.submit(
+                                make_cosmos_galaxies,
+                                coord=coord,
+                                bandpasses=list(bandpasses),
+                                seed=42,
+                                radius=tile_radius,
+                            )
+                        )
+                        gaia_futures.append(
+                            executor.submit(
+                                make_gaia_stars,
+                                coord=coord,
+                                bandpasses=list(bandpasses),
+                                seed=42,
+                                radius=tile_radius,
+                            )
+                        )
+                        star_futures.append(
+                            executor.submit(
+                                make_stars,
+                                coord=coord,
+                                n=n_stars,
+                                bandpasses=list(bandpasses),
+                                seed=42,
+                                radius=tile_radius,
+                            )
+                        )
+                    components = tuple(
+                        self._collect_tiles(futures)
+                        for futures in (gal_futures, gaia_futures, star_futures)
+                    )
+                self._write_cached_components(key, components)
+            self._component_cache[key] = components
+        return self._component_cache[key]
+
+    @classmethod
+    def _collect_tiles(cls, futures):
+        """
+        Gather one component's per-tile futures into a single Table.
+        """
+        results = [future.result() for future in futures]
+        if len(results) == 1:
+            return results[0]
+        return cls._stack_components(results)
+
+    def _tile_field(self):
+        """
+        Split the field into overlapping circular sub-cones.
+
+        One central tile plus a hexagonal ring of six, with radii sized
+        so their union covers the full cone with margin. Sources queried
+        twice in the overlap regions are removed later by the exact
+        coordinate deduplication.
+
+        Returns
+        -------
+        list of tuple
+            (ra, dec, radius) in degrees for each sub-cone.
+        """
+        tile_radius = 0.62 * self.radius
+        ring_radius = 0.55 * self.radius
+        cos_dec = max(np.cos(np.deg2rad(self.dec)), 1e-9)
+        tiles = [(self.ra, self.dec, tile_radius)]
+        for theta in np.linspace(0.0, 2.0 * np.pi, 7)[:-1]:
+            tiles.append(
+                (
+                    self.ra + ring_radius * np.cos(theta) / cos_dec,
+                    self.dec + ring_radius * np.sin(theta),
+                    tile_radius,
+                )
+            )
+        return tiles
+
+    @staticmethod
+    def _cache_paths(key) -> list[Path]:
+        """
+        Compute the on-disk cache paths for a field-definition key.
+
+        Parameters
+        ----------
+        key : tuple
+            The (ra, dec, radius, bandpasses) field definition.
+
+        Returns
+        -------
+        list of pathlib.Path
+            One Parquet path per component catalog.
+        """
+        key_hash = hashlib.sha1(
+            repr(key).encode(), usedforsecurity=False
+        ).hexdigest()
+        cache_dir = _component_cache_dir()
+        return [cache_dir / f"{key_hash}_{name}.parquet" for name in _COMPONENT_NAMES]
+
+    def _read_cached_components(self, key):
+        """
+        Load the component catalogs for `key` from the on-disk cache.
+
+        Parameters
+        ----------
+        key : tuple
+            The (ra, dec, radius, bandpasses) field definition.
+
+        Returns
+        -------
+        tuple of astropy.table.Table or None
+            The cached components, or None on any miss or read error (the
+            cache is advisory; failures fall back to regeneration).
+        """
+        try:
+            paths = self._cache_paths(key)
+            if not all(path.is_file() for path in paths):
+                return None
+            components = tuple(
+                Table.read(path, format="parquet") for path in paths
+            )
+        except Exception as e:
+            # not just OSError: a corrupt or truncated Parquet raises
+            # pyarrow errors, and those must fall back to regeneration
+            # too instead of wedging every later run
+            logger.debug("Component cache read failed: %s", e)
+            return None
+        logger.info("Loaded cached component catalogs for field %s", key[:3])
+        return components
+
+    def _write_cached_components(self, key, components) -> None:
+        """
+        Store freshly generated component catalogs in the on-disk cache.
+
+        Writes are atomic (write to a temporary file, then rename) and
+        best-effort: a full disk or read-only cache never aborts the run.
+
+        Parameters
+        ----------
+        key : tuple
+            The (ra, dec, radius, bandpasses) field definition.
+        components : tuple of astropy.table.Table
+            The galaxy, Gaia star, and synthetic star catalogs.
+        """
+        try:
+            for path, component in zip(
+                self._cache_paths(key), components, strict=True
+            ):
+                tmp_path = path.with_suffix(".tmp")
+                component.write(tmp_path, format="parquet", overwrite=True)
+                os.replace(tmp_path, path)
+        except OSError as e:
+            logger.debug("Component cache write failed: %s", e)
 
     def _generate_catalog(self, filter_list=None):
         """
@@ -65,51 +621,52 @@ class InputCatalog:
         ----------
         filter_list : list of str or None, optional
             List of filter names to use for bandpasses. If None, uses default filters.
+
+        Returns
+        -------
+        astropy.table.Table
+            The concatenated catalog, also kept on ``self.catalog``.
         """
         logger.info(
             f"Generating catalog at RA={self.ra} Dec={self.dec} radius={self.radius} deg"
         )
         if filter_list is None:
             filter_list = ["f062", "f087", "f106", "f129", "f158", "f184", "f213"]
-        bandpasses = [bp.upper() for bp in filter_list]
+        # canonical uppercase tuple: order-preserving, deduped, hashable
+        bandpasses = tuple(dict.fromkeys(str(bp).upper() for bp in filter_list))
 
-        coords = SkyCoord(
-            ra=self.ra, dec=self.dec, unit="deg", frame="icrs"
-        )
+        gal_cat, gaia_star_cat, star_cat = self._make_components(bandpasses)
 
-        # compute components
-        gal_cat = make_cosmos_galaxies(
-            coord=coords, bandpasses=bandpasses, seed=42, radius=self.radius
-        )
-        gaia_star_cat = make_gaia_stars(
-            coord=coords, bandpasses=bandpasses, seed=42, radius=self.radius
-        )
-        star_cat = make_stars(
-            coord=coords,
-            n=1000,
-            bandpasses=bandpasses,
-            seed=42,
-            radius=self.radius,
+        # deduplicate overlapping sources, concatenate, keep in memory for
+        # downstream consumers, and save once
+        catalog = self._stack_components(
+            self._deduplicate_components([gal_cat, gaia_star_cat, star_cat])
         )
+        if self.match_radius is not None:
+            catalog = self._deduplicate(catalog, match_radius=self.match_radius)
+        self.catalog = catalog
 
-        # concatenate and save
-        catalog = vstack([gal_cat, gaia_star_cat, star_cat])
-        catalog.write(self.catalog_filename, format="parquet", overwrite=True)
+        # hand the (I/O-bound) final write to a background thread so the
+        # summary bookkeeping overlaps it; join before returning
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            write_future = pool.submit(self._write_catalog, catalog)
+            logger.info(f"Concatenated catalog has {len(catalog)} sources.")
+            write_future.result()
 
         logger.info(
-            f"""
-              Final concatenated catalog saved to '{self.catalog_filename}'.
-              Total sources: {len(catalog)}.
-              """
+            f"Final concatenated catalog saved to '{self.catalog_filename}'."
         )
+        return catalog
 
     def run(self) -> None:
         """
         Run the Romanisim input catalog generation workflow.
 
-        This method creates a single catalog for all exposures.
+        This method creates a single catalog for all exposures, using the
+        union of the filters that actually appear in the observation plan
+        so each romanisim ``make_*`` call runs exactly once.
         """
-        self._generate_catalog()
+        self._generate_catalog(filter_list=self.bandpasses)
 
 
 def _cli():
@@ -134,6 +691,13 @@ def _cli():
         required=False,
         help="Output catalog filename (default: append '_cat' to the observation plan filename)",
     )
+    parser.add_argument(
+        "--output-format",
+        type=str,
+        default="parquet",
+        choices=["parquet", "ascii.ecsv"],
+        help="Output catalog format (default: parquet; ascii.ecsv for debug dumps)",
+    )
     parser.add_argument(
         "--ra",
         type=float,
@@ -149,10 +713,32 @@ def _cli():
     parser.add_argument(
         "--radius",
         type=float,
-        default=0.3,
-        help="Override: Radius of catalog (deg; default 0.3)",
+        default=None,
+        help=(
+            "Override: Radius of catalog (deg; default: bounding circle "
+            "of the plan pointings plus 0.3)"
+        ),
+    )
+    parser.add_argument(
+        "--match-radius",
+        type=float,
+        default=None,
+        help="Suppress near-duplicate sources within this separation (arcsec)",
+    )
+    parser.add_argument(
+        "--tiled",
+        action="store_true",
+        help="Decompose the field into concurrent sub-cone queries",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="count",
+        default=0,
+        help="Increase log verbosity (-v for INFO, -vv for DEBUG)",
     )
     args = parser.parse_args()
+    set_verbosity(args.verbose)
 
     input_catalog = InputCatalog(
         obs_plan_filename=args.obs_plan,
@@ -160,6 +746,9 @@ def _cli():
         ra=args.ra,
         dec=args.dec,
         radius=args.radius,
+        output_format=args.output_format,
+        match_radius=args.match_radius,
+        tiled=args.tiled,
     )
     input_catalog.run()
 
@@ -1,13 +1,106 @@
 import argparse
+import itertools
+import os
+import shutil
+import tempfile
 
-from roman_simulate_dr.scripts.logger import logger
+import numpy as np
+
+from roman_simulate_dr.scripts.logger import logger, set_verbosity
 from roman_simulate_dr.scripts.utils import (
-    generate_roman_filename,
+    default_worker_count,
+    generate_roman_filename_prefix,
     parallelize_jobs,
     read_obs_plan,
+    run_commands_async,
+)
+
+# resolve the executable once: an absolute path spares every spawn a
+# PATH search and lets CPython take its posix_spawn fast path. Falls back
+# to the bare name so import still works where romanisim is not installed
+# (the spawn itself will then fail with a clear error).
+_ROMANISIM_MAKE_IMAGE = (
+    shutil.which("romanisim-make-image") or "romanisim-make-image"
+)
+
+# tmpfs mount used to stage the catalog in RAM; the shared directory is
+# safe here because files in it are created via mkstemp, never at
+# predictable paths
+_TMPFS_DIR = "/dev/shm"  # noqa: S108
+
+# flat per-exposure job record; one contiguous array of these replaces a
+# list of per-job dicts in RomanisimImages.run
+_JOB_DTYPE = np.dtype(
+    [
+        ("ra", "f8"),
+        ("dec", "f8"),
+        ("roll", "f8"),
+        ("ma_table", "i4"),
+        ("sca", "i2"),
+        ("bandpass", "U8"),
+        ("out", "U128"),
+    ]
 )
 
 
+def _run_make_image_in_process(cmd: list[str]):
+    """
+    Execute one romanisim-make-image invocation inside this process.
+
+    Running the resolved console script with runpy keeps the exact CLI
+    argument semantics while skipping the interpreter startup and the
+    multi-second romanisim/galsim/stpsf import that every forked child
+    would otherwise repay: in a persistent worker process those imports
+    are paid once and reused for every exposure.
+
+    Module-level so it stays picklable for the process pool.
+
+    Parameters
+    ----------
+    cmd : list of str
+        The full argument vector, script path first.
+    """
+    import runpy
+    import sys
+
+    old_argv = sys.argv
+    sys.argv = list(cmd)
+    try:
+        runpy.run_path(cmd[0], run_name="__main__")
+    except SystemExit as err:
+        # argparse and friends signal failure via SystemExit; success is
+        # None/0 and should not abort the worker. A failure must become
+        # a regular exception: SystemExit is not an Exception, so it
+        # would sail through the pool's failure handling and exit the
+        # supervising process with the child's code instead of being
+        # recorded
+        if err.code not in (None, 0):
+            raise RuntimeError(f"exited with code {err.code}") from err
+    finally:
+        sys.argv = old_argv
+
+
+def _run_make_image_batch(cmds: list[list[str]]):
+    """
+    Run all exposures of one pointing inside the current worker.
+
+    Grouping the SCAs of a pointing into one task lets the worker reuse
+    whatever romanisim caches between invocations (reference files, the
+    parsed catalog in the page cache) and cuts the pool round-trips from
+    one per SCA to one per pointing.
+
+    Parameters
+    ----------
+    cmds : list of list of str
+        The command vectors of the batch, run in order.
+    """
+    for cmd in cmds:
+        try:
+            _run_make_image_in_process(cmd)
+        except Exception as err:
+            raise RuntimeError(f"{cmd[-1]} failed") from err
+
+
 class RomanisimImages:
     """
     Handles generation of simulated Roman L1 images based on an observation plan and input catalog.
@@ -17,8 +110,11 @@ class RomanisimImages:
         self,
         obs_plan_filename: str,
         input_filename: str,
-        max_workers: int = 1,
+        max_workers: int | None = None,
         sca_ids: list[int] | None = None,
+        force: bool = False,
+        fail_fast: bool = False,
+        in_process: bool = False,
     ):
         """
         Initialize the RomanisimImages object.
@@ -29,10 +125,24 @@ class RomanisimImages:
             Path to the observation plan file.
         input_filename : str
             Path to the input catalog file.
-        max_workers : int
-            Number of parallel workers to use for processing (default 1).
+        max_workers : int or None, optional
+            Number of parallel workers to use for processing. Defaults to
+            the number of CPUs available to this process; pass 1
+            explicitly to disable parallelism (e.g. for debugging).
         sca_ids : list of int or None, optional
             List of SCA IDs to use. If None, uses SCA 1.
+        force : bool, optional
+            If True, regenerate images whose output files already exist;
+            by default existing non-empty outputs are skipped so an
+            interrupted run can be resumed without redoing finished work.
+        fail_fast : bool, optional
+            If True, stop launching new simulations after the first
+            failure instead of working through the whole batch.
+        in_process : bool, optional
+            If True, run each simulation inside a persistent worker
+            process instead of spawning a fresh romanisim-make-image
+            child per exposure; the heavy romanisim imports are then
+            paid once per worker rather than once per job.
 
         Raises
         ------
@@ -45,8 +155,11 @@ class RomanisimImages:
             raise ValueError("An input catalog filename must be provided.")
         self.plan = read_obs_plan(obs_plan_filename)
         self.input_filename = input_filename
-        self.max_workers = max_workers
+        self.max_workers = max_workers or default_worker_count()
         self.sca_ids = self._create_sca_id_list(sca_ids)
+        self.force = force
+        self.fail_fast = fail_fast
+        self.in_process = in_process
 
     def _create_sca_id_list(self, sca_ids: list[int] | None = None) -> list[int]:
         """
@@ -73,8 +186,65 @@ class RomanisimImages:
             return list(range(1, 18))
         return sca_ids
 
-    def _generate_simulated_images(
-        self,
+    @staticmethod
+    def _stage_catalog(input_filename: str) -> str:
+        """
+        Copy the input catalog to tmpfs so jobs read it from RAM.
+
+        Every simulation job re-opens the catalog; staging it once on
+        /dev/shm serves all those reads from memory even when the
+        original lives on a slow networked filesystem. Returns the
+        original path unchanged when tmpfs is unavailable, the file does
+        not exist yet, or the copy fails — staging is an optimization,
+        never a requirement.
+
+        Parameters
+        ----------
+        input_filename : str
+            Path to the input catalog.
+
+        Returns
+        -------
+        str
+            Path the jobs should read: the staged copy or the original.
+        """
+        try:
+            if not os.path.isdir(_TMPFS_DIR) or not os.path.isfile(input_filename):
+                return input_filename
+            # mkstemp, not a hand-composed name: /dev/shm is shared and
+            # world-writable, so a predictable path could be pre-created
+            # (or symlinked) by another user and clobbered through
+            suffix = os.path.splitext(input_filename)[1]
+            fd, staged = tempfile.mkstemp(
+                prefix="rdr_catalog_", suffix=suffix, dir=_TMPFS_DIR
+            )
+            try:
+                with os.fdopen(fd, "wb") as staged_file, open(
+                    input_filename, "rb"
+                ) as original:
+                    shutil.copyfileobj(original, staged_file)
+            except OSError:
+                os.unlink(staged)
+                raise
+            return staged
+        except OSError:
+            return input_filename
+
+    @staticmethod
+    def _output_exists(output_filename: str) -> bool:
+        """
+        Return True if `output_filename` exists and is non-empty.
+
+        Zero-byte files (e.g. left behind by a killed job) do not count
+        as finished outputs.
+        """
+        try:
+            return os.path.getsize(output_filename) > 0
+        except OSError:
+            return False
+
+    @staticmethod
+    def _build_command(
         radec: tuple = (270.0, 66.0),
         level: int = 1,
         sca: int = 1,
@@ -86,99 +256,290 @@ class RomanisimImages:
         date: str = "2027-06-01T00:00:00",
         drop_extra_dq: bool = True,
         output_filename: str = "romanisim_simulated_image.asdf",
-    ):
+        static_args: list[str] | None = None,
+    ) -> list[str]:
         """
-        Run the romanisim simulation with the given parameters.
-        """
-        import subprocess
+        Build the romanisim-make-image command line for one exposure.
 
-        cmd = [
-            "romanisim-make-image",
+        Callers building many commands should precompute the run-invariant
+        argv segment once with `_static_command_args` and pass it as
+        `static_args`, so per-job assembly only formats the fields that
+        actually vary between jobs.
+        """
+        if static_args is None:
+            static_args = RomanisimImages._static_command_args(
+                level=level,
+                catalog=catalog,
+                stpsf=stpsf,
+                date=date,
+                drop_extra_dq=drop_extra_dq,
+            )
+        return [
+            _ROMANISIM_MAKE_IMAGE,
             "--radec",
             str(radec[0]),
             str(radec[1]),
-            "--level",
-            str(level),
             "--sca",
             str(sca),
             "--bandpass",
             str(bandpass),
             "--roll",
             str(roll),
+            "--ma_table_number",
+            str(ma_table_number),
+            *static_args,
+            output_filename,
+        ]
+
+    @staticmethod
+    def _static_command_args(
+        level: int = 1,
+        catalog: str = "",
+        stpsf: bool = True,
+        date: str = "2027-06-01T00:00:00",
+        drop_extra_dq: bool = True,
+    ) -> list[str]:
+        """
+        Build the argv segment shared by every job in a run.
+
+        Option order is irrelevant to romanisim's argparse CLI, so the
+        invariant options are grouped here and spliced into each command
+        after the per-job fields.
+        """
+        return [
+            "--level",
+            str(level),
             "--catalog",
             str(catalog),
             *(["--stpsf"] if stpsf else []),
-            "--ma_table_number",
-            str(ma_table_number),
             "--date",
             date,
             "--rng_seed",
             "1",
             "--usecrds",
             *(["--drop-extra-dq"] if drop_extra_dq else []),
-            output_filename,
         ]
 
-        result = subprocess.run(
-            cmd, capture_output=True, text=True, shell=False, check=False
-        )
-        logger.info(f"[{output_filename}] STDOUT:\n{result.stdout}")
-        if result.returncode != 0:
-            logger.error(f"[{output_filename}] STDERR:\n{result.stderr}")
-        else:
-            logger.info(f"[{output_filename}] STDERR:\n{result.stderr}")
-
-        return output_filename, result.returncode
-
     def run(self):
         """
         Run the romanisim simulation workflow for all passes and visits in the plan.
         """
-        jobs = []
+        # hoist everything invariant across the inner SCA loop: the SCA ids
+        # (normalized to int once), the catalog filename, and the per-row
+        # quantities that do not depend on the SCA
+        sca_ids = [int(sca) for sca in self.sca_ids]
+        # every child re-reads the full input catalog; one copy staged on
+        # tmpfs serves all those reads from RAM instead of the (possibly
+        # networked) filesystem holding the original
+        catalog = self._stage_catalog(self.input_filename)
+        # one flat structured array instead of a list of dicts: compact
+        # contiguous storage the dedup, ordering, and resume filters below
+        # can operate on with vectorized numpy instead of Python objects;
+        # kwargs dicts are only materialized at submit time
+        jobs = np.empty(len(self.plan) * len(sca_ids), dtype=_JOB_DTYPE)
+        i = 0
+        # pull each plan column out as a plain numpy array once and zip
+        # over those: per-item access on astropy Row objects resolves the
+        # column by name on every lookup, which dominates the loop cost
+        # for large plans, and naming the columns here decouples the loop
+        # from the plan's column order
+        columns = tuple(
+            np.asarray(self.plan[name])
+            for name in (
+                "RA",
+                "DEC",
+                "PA",
+                "BANDPASS",
+                "MA_TABLE_NUMBER",
+                "PLAN",
+                "PASS",
+                "SEGMENT",
+                "OBSERVATION",
+                "VISIT",
+                "EXPOSURE",
+            )
+        )
         for (
             ra_ref,
             dec_ref,
             pa,
             bandpass,
             ma_table_number,
-            _,  # duration, not used here
             plan,
             pidx,
             segment,
             observation,
             vidx,
             eidx,
-        ) in self.plan:
-            for sca in self.sca_ids:
-                bandpass = bandpass.upper()
-                output_filename = generate_roman_filename(
-                    program=1,
-                    plan=plan,
-                    passno=int(pidx),
-                    segment=segment,
-                    observation=observation,
-                    visit=int(vidx),
-                    exposure=int(eidx),
-                    sca=int(sca),
-                    bandpass=bandpass,
-                    suffix="uncal",
+        ) in zip(*columns, strict=True):
+            bandpass = bandpass.upper()
+            # format the shared filename stem once per exposure; only the
+            # SCA varies in the inner loop
+            prefix = generate_roman_filename_prefix(
+                program=1,
+                plan=plan,
+                passno=int(pidx),
+                segment=segment,
+                observation=observation,
+                visit=int(vidx),
+                exposure=int(eidx),
+            )
+            bandpass_lower = bandpass.lower()
+            for sca in sca_ids:
+                output_filename = f"{prefix}_wfi{sca:02d}_{bandpass_lower}_uncal.asdf"
+                jobs[i] = (
+                    ra_ref,
+                    dec_ref,
+                    pa,
+                    ma_table_number,
+                    sca,
+                    bandpass,
+                    output_filename,
+                )
+                i += 1
+        # dedup by output filename: plans that repeat a (visit, exposure,
+        # SCA, filter) combination would otherwise simulate the same image
+        # several times, with the later jobs clobbering the earlier ones
+        _, unique_indices = np.unique(jobs["out"], return_index=True)
+        if len(unique_indices) < len(jobs):
+            logger.info(
+                "Deduplicated %d -> %d jobs", len(jobs), len(unique_indices)
+            )
+            jobs = jobs[unique_indices]
+        # neighboring jobs share pointing, bandpass-dependent reference
+        # files, and SCA state, so ordering them this way keeps the page
+        # cache and CRDS caches warm across consecutive children. The
+        # keys mirror the in-process batching key (pointing, roll,
+        # bandpass) so each batch's members end up adjacent
+        jobs = jobs[
+            np.lexsort(
+                (
+                    jobs["sca"],
+                    jobs["bandpass"],
+                    jobs["roll"],
+                    jobs["dec"],
+                    jobs["ra"],
                 )
-                jobs.append(
-                    dict(
-                        radec=(ra_ref, dec_ref),
-                        sca=sca,
-                        bandpass=bandpass,
-                        roll=pa,
-                        ma_table_number=ma_table_number,
-                        catalog=self.input_filename,
-                        output_filename=output_filename,
+            )
+        ]
+        if not self.force:
+            # resume support: a non-empty output means the exposure was
+            # already simulated, so don't pay for it again
+            pending = np.fromiter(
+                (not self._output_exists(out) for out in jobs["out"]),
+                dtype=bool,
+                count=len(jobs),
+            )
+            if not pending.all():
+                logger.info(
+                    "Skipping %d of %d jobs with existing outputs "
+                    "(use --force to regenerate)",
+                    len(jobs) - int(pending.sum()),
+                    len(jobs),
+                )
+                jobs = jobs[pending]
+        # the invariant half of the argv (catalog, level, date, seed...)
+        # is built once and reused; only per-job fields are formatted in
+        # the comprehension
+        static_args = self._static_command_args(catalog=catalog)
+        commands = [
+            self._build_command(
+                radec=(float(job["ra"]), float(job["dec"])),
+                sca=int(job["sca"]),
+                bandpass=str(job["bandpass"]),
+                roll=float(job["roll"]),
+                ma_table_number=int(job["ma_table"]),
+                output_filename=str(job["out"]),
+                static_args=static_args,
+            )
+            for job in jobs
+        ]
+        try:
+            if self.in_process:
+                # persistent warm workers execute the console script via
+                # runpy, so romanisim's multi-second import cost is paid once
+                # per worker instead of once per exposure. All SCAs of one
+                # pointing/bandpass form a single batch (the job array is
+                # sorted, so the group members are adjacent), letting the
+                # worker reuse per-pointing state between them
+                batches = [
+                    {"cmds": [cmd for _, cmd in group]}
+                    for _, group in itertools.groupby(
+                        zip(jobs, commands, strict=True),
+                        key=lambda item: (
+                            item[0]["ra"],
+                            item[0]["dec"],
+                            item[0]["roll"],
+                            item[0]["bandpass"],
+                        ),
                     )
+                ]
+                results = parallelize_jobs(
+                    _run_make_image_batch,
+                    batches,
+                    max_workers=self.max_workers,
+                    pool_kind="process",
+                    fail_fast=self.fail_fast,
                 )
-        parallelize_jobs(
-            self._generate_simulated_images,
-            jobs,
-            max_workers=self.max_workers,
-        )
+                # a failed batch is identified by its first output filename;
+                # the chained exception names the exact exposure that failed
+                failures = [(job["cmds"][0][-1], exc) for job, exc in results]
+            else:
+                if os.sep not in _ROMANISIM_MAKE_IMAGE:
+                    # which() failed at import time; surface it once here
+                    # rather than as max_workers identical spawn errors
+                    logger.warning(
+                        "romanisim-make-image was not found on PATH at "
+                        "import time; spawns will fail unless it has "
+                        "appeared since"
+                    )
+                # children inherit our environment with the numerical
+                # libraries pinned to one thread each, so max_workers
+                # simulators do not oversubscribe the CPUs with
+                # max_workers x N_BLAS thread teams
+                child_env = dict(os.environ)
+                for var in (
+                    "OPENBLAS_NUM_THREADS",
+                    "OMP_NUM_THREADS",
+                    "MKL_NUM_THREADS",
+                ):
+                    child_env.setdefault(var, "1")
+                # one event loop supervises all children instead of one
+                # thread or process per subprocess: the workers here are
+                # external commands, so the supervisor only needs to
+                # await them. Each child's verbose output goes to
+                # <output>.log on disk instead of through the supervisor,
+                # so a failure can be diagnosed afterwards at any
+                # verbosity
+                failures = run_commands_async(
+                    commands,
+                    max_workers=self.max_workers,
+                    labels=[str(out) for out in jobs["out"]],
+                    fail_fast=self.fail_fast,
+                    log_paths=[f"{out}.log" for out in jobs["out"]],
+                    env=child_env,
+                )
+        finally:
+            if catalog != self.input_filename:
+                try:
+                    os.unlink(catalog)
+                except OSError:
+                    pass
+        if failures:
+            # in-process failures are per batch, not per exposure, so
+            # report them against the batch count to keep the units honest
+            if self.in_process:
+                total, unit = len(batches), "batches"
+            else:
+                total, unit = len(jobs), "jobs"
+            logger.error(
+                "%d of %d simulation %s failed: %s",
+                len(failures),
+                total,
+                unit,
+                ", ".join(label for label, _ in failures),
+            )
+        return failures
 
 
 def _cli():
@@ -204,8 +565,10 @@ def _cli():
     parser.add_argument(
         "--max-workers",
         type=int,
-        default=1,
-        help="Number of parallel workers for exposure generation (default: 1, disables parallelization)",
+        default=None,
+        help="Number of parallel workers for exposure generation "
+        "(default: all CPUs available to this process; pass 1 to disable "
+        "parallelization)",
     )
     parser.add_argument(
         "--sca-ids",
@@ -214,14 +577,48 @@ def _cli():
         default=[1],
         help="List of SCA IDs to simulate (default: [1])",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate images even if their output files already exist",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop launching new simulations after the first failure",
+    )
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help=(
+            "Run simulations inside persistent worker processes instead of "
+            "one romanisim-make-image child per exposure"
+        ),
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="count",
+        default=0,
+        help="Increase log verbosity (-v for INFO, -vv for DEBUG)",
+    )
     args = parser.parse_args()
+    set_verbosity(args.verbose)
     input_catalog = RomanisimImages(
         obs_plan_filename=args.obs_plan,
         input_filename=args.input_filename,
         max_workers=args.max_workers,
         sca_ids=args.sca_ids,
+        force=args.force,
+        fail_fast=args.fail_fast,
+        in_process=args.in_process,
     )
-    input_catalog.run()
+    failures = input_catalog.run()
+    if failures:
+        # the failures are already logged with their labels; a non-zero
+        # exit lets scripted pipelines tell a broken batch from a clean
+        # one
+        raise SystemExit(1)
     logger.info("Done.")
 
 
@@ -1,7 +1,20 @@
 import logging
 
 logging.basicConfig(
-    level=logging.INFO,
+    level=logging.WARNING,
     format="%(asctime)s %(levelname)s %(processName)s %(message)s",
 )
 logger = logging.getLogger(__name__)
+
+
+def set_verbosity(verbosity: int) -> None:
+    """
+    Raise the log level from the quiet default.
+
+    Parameters
+    ----------
+    verbosity : int
+        0 keeps the default (WARNING), 1 enables INFO, 2 or more DEBUG.
+    """
+    level = logging.WARNING - 10 * min(verbosity, 2)
+    logging.getLogger().setLevel(level)
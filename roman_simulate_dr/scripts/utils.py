@@ -1,55 +1,471 @@
+import asyncio
+import atexit
+import functools
+import importlib
 import logging
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
 
 from astropy.table import Table
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# module-level so the process pool outlives individual parallelize_jobs
+# calls: workers (and their warm imports) are paid for once per run
+_process_pool = None
+_process_pool_config = None
 
-def read_obs_plan(filename: str) -> Table:
+
+def _worker_init():
+    """
+    Initialize a long-lived worker process.
+
+    Pins the numerical libraries to one thread and warm-imports the heavy
+    simulation dependencies so each worker pays the import cost once
+    instead of once per job. The optional pieces of the stack (PSF and
+    reference-file handling) are tolerated missing so the pool still
+    works in lighter environments.
+    """
+    limit_blas_threads()
+    import romanisim.catalog  # noqa: F401
+
+    for module in ("galsim", "stpsf", "crds"):
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+
+
+def make_pool(max_workers: int, initializer=None) -> ProcessPoolExecutor:
+    """
+    Return the shared long-lived process pool, creating it on first use.
+
+    The pool persists across parallelize_jobs calls so worker startup and
+    warm imports are amortized over the whole run; it is rebuilt (old pool
+    shut down, new one created) if a different worker count or initializer
+    is requested — existing workers were initialized with the previous
+    callable and cannot be retrofitted — and shut down automatically at
+    interpreter exit.
+
+    Parameters
+    ----------
+    max_workers : int
+        Number of worker processes.
+    initializer : callable or None, optional
+        Per-worker initializer; defaults to `_worker_init`.
+
+    Returns
+    -------
+    concurrent.futures.ProcessPoolExecutor
+        The shared executor.
+    """
+    global _process_pool, _process_pool_config
+    initializer = initializer or _worker_init
+    config = (max_workers, initializer)
+    if _process_pool is None or _process_pool_config != config:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False)
+        _process_pool = ProcessPoolExecutor(
+            max_workers=max_workers, initializer=initializer
+        )
+        _process_pool_config = config
+    return _process_pool
+
+
+@atexit.register
+def _shutdown_pool():
+    """
+    Shut down the shared process pool at interpreter exit.
+    """
+    if _process_pool is not None:
+        _process_pool.shutdown()
+
+
+@functools.lru_cache(maxsize=8)
+def _read_obs_plan_cached(abspath: str, mtime_ns: int) -> Table:
+    """
+    Parse an observation plan, memoized on (absolute path, mtime).
+
+    The mtime in the key invalidates the entry automatically when the
+    file changes on disk. Across processes, a Parquet sidecar
+    (``<plan>.parquet``) written after the first parse serves later cold
+    starts: reading columnar Parquet is orders of magnitude faster than
+    astropy's ASCII ECSV parser. The sidecar is only trusted while it is
+    at least as new as the plan itself, and both writing and reading it
+    are best-effort — the ECSV stays the source of truth.
+    """
+    sidecar = abspath + ".parquet"
+    try:
+        if os.stat(sidecar).st_mtime_ns >= mtime_ns:
+            return Table.read(sidecar, format="parquet")
+    except Exception as e:
+        # missing, unreadable, or corrupt sidecar: fall through to ECSV
+        logger.debug("Plan sidecar read failed for %s: %s", sidecar, e)
+    # the fast C tokenizer parses the data section several times faster
+    # than the pure-Python reader; the ECSV header is parsed either way
+    table = Table.read(abspath, format="ascii.ecsv", fast_reader=True)
+    try:
+        table.write(sidecar, format="parquet", overwrite=True)
+    except Exception as e:
+        # read-only directory or a column type Parquet cannot hold;
+        # the cache is an optimization, never a requirement
+        logger.debug("Plan sidecar write failed for %s: %s", sidecar, e)
+    return table
+
+
+def read_obs_plan(filename) -> Table:
     """
     Reads an observation plan from an ECSV file.
 
+    Both catalog generation and image simulation read the same plan in
+    one process; the parsed table is cached so the second (and later)
+    reads are a table copy instead of a full ECSV parse. A copy is
+    returned so callers cannot mutate the cached table.
+
     Parameters
     ----------
-    filename : str
-        Path to the ECSV file.
+    filename : str or file-like
+        Path to the ECSV file, or an open file-like object holding ECSV
+        content (e.g. io.StringIO). File-like input bypasses the cache
+        and the sidecar, since there is no path or mtime to key them on.
 
     Returns
     -------
     astropy.table.Table
         The observation plan as an Astropy Table.
     """
-    return Table.read(filename, format="ascii.ecsv")
+    if hasattr(filename, "read"):
+        # astropy's ascii reader wants a string or line iterable rather
+        # than a text handle, so drain the handle first
+        return Table.read(filename.read(), format="ascii.ecsv")
+    abspath = os.path.abspath(filename)
+    return _read_obs_plan_cached(abspath, os.stat(abspath).st_mtime_ns).copy()
 
 
-def parallelize_jobs(method, jobs, max_workers: int | None = None):
+def default_worker_count() -> int:
     """
-    Run jobs in parallel using ThreadPoolExecutor.
+    Return the number of CPUs available to this process.
+
+    Honors CPU affinity masks (cgroups, taskset, batch schedulers) where
+    the platform exposes them, falling back to the total CPU count
+    elsewhere. Used as the default worker count so parallel runs saturate
+    the allocation without oversubscribing it.
+
+    Returns
+    -------
+    int
+        The usable CPU count, at least 1.
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def limit_blas_threads():
+    """
+    Pin the numerical libraries of a worker to a single thread.
+
+    Intended as a pool `initializer`: when N workers each spawn their own
+    BLAS/OpenMP thread teams, N_workers x N_BLAS_threads quickly exceeds
+    the core count and every job slows down. Only sets the variables if
+    the caller has not already chosen values.
+    """
+    for var in ("OPENBLAS_NUM_THREADS", "OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ.setdefault(var, "1")
+
+
+def _drain_results(results, total: int):
+    """
+    Collect failures from a result stream, logging aggregate progress.
+
+    One log line per ~10% of the batch instead of one per job: for
+    thousands of short jobs, per-job logging serializes the workers on
+    the logging lock and floods the output.
+
+    Parameters
+    ----------
+    results : iterable
+        (job, exception) tuples or None, in completion order.
+    total : int
+        Number of jobs in the batch.
+
+    Returns
+    -------
+    list of tuple
+        The non-None entries, i.e. the failures.
+    """
+    failures = []
+    step = max(1, total // 10)
+    for done, result in enumerate(results, 1):
+        if result is not None:
+            failures.append(result)
+        if done % step == 0 or done == total:
+            logger.info("Completed %d/%d jobs", done, total)
+    return failures
+
+
+def _submit_fail_fast(executor, dispatch, jobs):
+    """
+    Run jobs through `executor`, cancelling the pending ones on failure.
+
+    Jobs are submitted one per future (no chunking) so the not-yet-
+    started ones can be cancelled as soon as any job fails; already
+    running jobs finish. Cancelled jobs are reported with None in place
+    of an exception, matching `run_commands_async`'s fail-fast contract.
+
+    Parameters
+    ----------
+    executor : concurrent.futures.Executor
+        The pool to submit to.
+    dispatch : callable
+        `_apply_job` bound to the job method.
+    jobs : list of dict
+        Keyword arguments for each call.
+
+    Returns
+    -------
+    list of tuple
+        (job, exception) pairs for jobs that raised, plus (job, None)
+        for jobs cancelled after the first failure.
+    """
+    futures = {executor.submit(dispatch, job): job for job in jobs}
+    failures = []
+    for future in as_completed(futures):
+        if future.cancelled():
+            failures.append((futures[future], None))
+            continue
+        result = future.result()
+        if result is not None:
+            failures.append(result)
+            for pending in futures:
+                pending.cancel()
+    return failures
+
+
+def _apply_job(method, job):
+    """
+    Invoke `method` with one job's keyword arguments, capturing failures.
+
+    Module-level (and combined with `functools.partial`) so it stays
+    picklable for process pools.
+
+    Parameters
+    ----------
+    method : callable
+        The function or method to execute.
+    job : dict
+        Keyword arguments for the call.
+
+    Returns
+    -------
+    tuple or None
+        (job, exception) if the call raised, None on success.
+    """
+    try:
+        method(**job)
+    except Exception as e:
+        return (job, e)
+    return None
+
+
+def parallelize_jobs(
+    method,
+    jobs,
+    max_workers: int | None = None,
+    initializer=None,
+    pool_kind: str = "thread",
+    fail_fast: bool = False,
+):
+    """
+    Run jobs in parallel using a thread or process pool.
 
     Parameters
     ----------
     method : callable
-        The function or method to execute for each job.
+        The function or method to execute for each job. For
+        `pool_kind="process"` it must be picklable (a module-level
+        function or a bound method of a picklable object).
     jobs : list of dict
         Each dict contains the keyword arguments for one call to `method`.
     max_workers : int or None, optional
         Number of parallel workers. If None or <= 1, jobs are run sequentially.
+    initializer : callable or None, optional
+        Called once per worker before it starts taking jobs (e.g.
+        `limit_blas_threads`). In sequential mode it is called once.
+    pool_kind : str, optional
+        "thread" (default) or "process". Use "process" for CPU-bound jobs
+        that would otherwise serialize on the GIL.
+    fail_fast : bool, optional
+        If True, stop dispatching new jobs after the first failure;
+        jobs skipped this way are reported with None in place of an
+        exception.
 
     Returns
     -------
-    None
+    list of tuple
+        (job, exception) pairs for every job that raised, so the caller
+        can inspect or resubmit only the failures. Empty when all jobs
+        succeeded.
     """
+    failures = []
+    jobs = list(jobs)
     if max_workers and max_workers > 1:
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = [executor.submit(method, **job) for job in jobs]
-            for future, _ in zip(as_completed(futures), jobs, strict=False):
-                future.result()
+        dispatch = functools.partial(_apply_job, method)
+        if fail_fast:
+            # one future per job so the pending ones can be cancelled;
+            # the chunking optimization below would tie each failure to
+            # a whole chunk of jobs already handed to a worker
+            if pool_kind == "process":
+                executor = make_pool(max_workers, initializer=initializer)
+                return _submit_fail_fast(executor, dispatch, jobs)
+            with ThreadPoolExecutor(
+                max_workers=max_workers, initializer=initializer
+            ) as executor:
+                return _submit_fail_fast(executor, dispatch, jobs)
+        # batch several jobs per dispatch: amortizes the per-task IPC
+        # round-trip, which dominates for short jobs at high fan-out
+        chunksize = max(1, len(jobs) // (max_workers * 4))
+        if pool_kind == "process":
+            # persistent pool: workers and their warm imports are reused
+            # across calls instead of being torn down each time
+            executor = make_pool(max_workers, initializer=initializer)
+            results = executor.map(dispatch, jobs, chunksize=chunksize)
+            failures = _drain_results(results, len(jobs))
+        else:
+            with ThreadPoolExecutor(
+                max_workers=max_workers, initializer=initializer
+            ) as executor:
+                results = executor.map(dispatch, jobs, chunksize=chunksize)
+                failures = _drain_results(results, len(jobs))
     else:
-        for job in jobs:
-            method(**job)
+        if initializer is not None:
+            initializer()
+        for done, job in enumerate(jobs):
+            try:
+                method(**job)
+            except Exception as e:
+                failures.append((job, e))
+                if fail_fast:
+                    failures.extend((j, None) for j in jobs[done + 1 :])
+                    break
+    return failures
+
+
+def run_commands_async(
+    commands,
+    max_workers: int = 1,
+    labels=None,
+    fail_fast: bool = False,
+    log_paths=None,
+    env=None,
+):
+    """
+    Run external commands concurrently under a single asyncio event loop.
+
+    A thread-per-child supervisor pays a full thread stack per worker just
+    to sit in ``wait()``; one event loop supervises any number of children
+    from a single thread, so the concurrency cap can be raised to match
+    I/O and CPU capacity rather than supervisor memory. Each child's
+    output (stderr merged into stdout) is streamed line by line to the
+    logger as it arrives.
+
+    Parameters
+    ----------
+    commands : list of list of str
+        Argument vectors to execute.
+    max_workers : int, optional
+        Maximum number of children running at once (default 1).
+    labels : list of str or None, optional
+        Per-command labels used to prefix logged output; defaults to each
+        command's executable name.
+    fail_fast : bool, optional
+        If True, stop launching new children after the first non-zero
+        exit (children already running finish normally), so a doomed
+        batch aborts in minutes instead of hours. Commands that were
+        never started are reported with a returncode of None.
+    log_paths : list of str or None, optional
+        Per-command log file paths. When given, each child's output goes
+        straight to its file via an inherited descriptor — the kernel
+        writes it with no supervisor involvement — instead of being
+        pumped through the logger, and the full output survives at any
+        verbosity.
+    env : dict or None, optional
+        Environment for the children; inherited from this process when
+        None. Passing an explicit environment lets callers pin e.g. the
+        BLAS thread count so N children do not oversubscribe the CPUs.
+
+    Returns
+    -------
+    list of tuple
+        (label, returncode) pairs for every command that exited non-zero
+        (or was skipped by fail_fast, with returncode None), so the
+        caller can inspect or resubmit only the failures. Empty when all
+        commands succeeded.
+    """
+    commands = list(commands)
+    if labels is None:
+        labels = [cmd[0] for cmd in commands]
+    # aggregate progress: one log line per ~10% of the batch; the event
+    # loop is single-threaded, so a plain counter needs no locking
+    progress = {"done": 0}
+    step = max(1, len(commands) // 10)
+
+    async def _run_one(semaphore, stop, cmd, label, log_path):
+        async with semaphore:
+            if stop.is_set():
+                return label, None
+            if log_path is not None:
+                with open(log_path, "w") as log_file:
+                    proc = await asyncio.create_subprocess_exec(
+                        *cmd,
+                        stdout=log_file,
+                        stderr=asyncio.subprocess.STDOUT,
+                        env=env,
+                    )
+                    returncode = await proc.wait()
+            else:
+                proc = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.STDOUT,
+                    env=env,
+                )
+                async for line in proc.stdout:
+                    logger.debug(
+                        "[%s] %s", label, line.decode(errors="replace").rstrip()
+                    )
+                returncode = await proc.wait()
+            if returncode != 0:
+                logger.error("[%s] exited with code %d", label, returncode)
+                if fail_fast:
+                    stop.set()
+            progress["done"] += 1
+            if progress["done"] % step == 0 or progress["done"] == len(commands):
+                logger.info(
+                    "Completed %d/%d commands", progress["done"], len(commands)
+                )
+            return label, returncode
+
+    async def _main():
+        semaphore = asyncio.Semaphore(max(1, max_workers))
+        stop = asyncio.Event()
+        paths = log_paths if log_paths is not None else [None] * len(commands)
+        return await asyncio.gather(
+            *(
+                _run_one(semaphore, stop, cmd, label, log_path)
+                for cmd, label, log_path in zip(
+                    commands, labels, paths, strict=True
+                )
+            )
+        )
+
+    results = asyncio.run(_main())
+    return [(label, returncode) for label, returncode in results if returncode != 0]
 
 
 def generate_roman_filename(
@@ -99,15 +515,50 @@ def generate_roman_filename(
     str
         The generated Roman filename encoding all provided parameters.
     """
-    filename = (
-        f"r{program}{plan:02d}{passno:03d}{segment:03d}"
-        f"{observation:03d}{visit:03d}_{exposure:04d}"
-        f"_wfi{sca:02d}_{bandpass.lower()}_{suffix}.asdf"
+    prefix = generate_roman_filename_prefix(
+        program, plan, passno, segment, observation, visit, exposure
+    )
+    return f"{prefix}_wfi{sca:02d}_{bandpass.lower()}_{suffix}.asdf"
+
+
+# bound .format of a precompiled template: one formatting call per
+# exposure instead of seven per-field f-string operations, which adds up
+# across the visit x exposure product of a large plan
+_PREFIX_FORMAT = "r{:d}{:02d}{:03d}{:03d}{:03d}{:03d}_{:04d}".format
+
+
+def generate_roman_filename_prefix(
+    program: int,
+    plan: int,
+    passno: int,
+    segment: int,
+    observation: int,
+    visit: int,
+    exposure: int,
+) -> str:
+    """
+    Build the filename stem an exposure shares across SCAs and suffixes.
+
+    Callers iterating over SCAs can format this once per exposure and
+    append only the varying ``_wfi{sca}_{bandpass}_{suffix}.asdf`` tail
+    per file.
+
+    Parameters
+    ----------
+    program, plan, passno, segment, observation, visit, exposure : int
+        Observation identifiers, as for `generate_roman_filename`.
+
+    Returns
+    -------
+    str
+        The filename stem, e.g. ``"r102003004005006_0007"``.
+    """
+    return _PREFIX_FORMAT(
+        program, plan, passno, segment, observation, visit, exposure
     )
-    return filename
 
 
-def generate_catalog_name(obs_plan_filename: str) -> str:
+def generate_catalog_name(obs_plan_filename: str, ext: str | None = None) -> str:
     """
     Generate a catalog filename by appending '_cat' before the file extension.
 
@@ -115,11 +566,15 @@ def generate_catalog_name(obs_plan_filename: str) -> str:
     ----------
     obs_plan_filename : str
         The observation plan filename.
+    ext : str or None, optional
+        Extension for the catalog file (e.g. ".parquet"). By default the
+        plan's own extension is kept. Readers dispatch on the extension,
+        so it must match the format actually written.
 
     Returns
     -------
     str
         The derived catalog filename.
     """
-    base, ext = os.path.splitext(obs_plan_filename)
-    return f"{base}_cat{ext}"
+    base, plan_ext = os.path.splitext(obs_plan_filename)
+    return f"{base}_cat{plan_ext if ext is None else ext}"
@@ -1,13 +1,16 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
+import numpy as np
 import pytest
+from astropy.table import Table
 
 from roman_simulate_dr.scripts.generate_input_catalog import InputCatalog
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_plan():
-    # Minimal plan with RA and DEC columns
+    # Minimal plan with RA and DEC columns; module-scoped because no
+    # test mutates it
     return {"RA": [10.0, 20.0], "DEC": [30.0, 40.0]}
 
 
@@ -32,38 +35,130 @@ def test_init_sets_attributes(mock_read_obs_plan, mock_plan):
     assert obj.radius == 0.5
 
 
-@patch("roman_simulate_dr.scripts.generate_input_catalog.vstack")
-@patch("roman_simulate_dr.scripts.generate_input_catalog.make_stars")
-@patch("roman_simulate_dr.scripts.generate_input_catalog.make_gaia_stars")
-@patch("roman_simulate_dr.scripts.generate_input_catalog.make_cosmos_galaxies")
+# the generators are imported lazily inside _make_components, so patch
+# them at their source module rather than the (absent) module attribute
+@patch("romanisim.catalog.make_stars")
+@patch("romanisim.catalog.make_gaia_stars")
+@patch("romanisim.catalog.make_cosmos_galaxies")
 @patch("roman_simulate_dr.scripts.generate_input_catalog.read_obs_plan")
 def test_generate_catalog_calls_components(
     mock_read_obs_plan,
     mock_make_cosmos_galaxies,
     mock_make_gaia_stars,
     mock_make_stars,
-    mock_vstack,
     mock_plan,
+    tmp_path,
+    monkeypatch,
 ):
     """
     Purpose: Ensure that _generate_catalog calls all required component
-    functions and writes the catalog using the correct filename and format.
+    functions, concatenates and deduplicates their output, and writes the
+    final catalog to the requested filename.
     """
+    monkeypatch.setenv("ROMAN_CAT_CACHE", str(tmp_path / "cache"))
     mock_read_obs_plan.return_value = mock_plan
-    mock_make_cosmos_galaxies.return_value = MagicMock()
-    mock_make_gaia_stars.return_value = MagicMock()
-    mock_make_stars.return_value = MagicMock()
-    mock_catalog = MagicMock()
-    mock_vstack.return_value = mock_catalog
-    obj = InputCatalog("plan.ecsv", output_catalog_filename="out.ecsv")
+    mock_make_cosmos_galaxies.return_value = Table(
+        {"ra": [1.0, 2.0], "dec": [1.0, 2.0], "F062": [1.0, 2.0]}
+    )
+    mock_make_gaia_stars.return_value = Table(
+        {"ra": [3.0], "dec": [3.0], "F062": [3.0]}
+    )
+    # first row duplicates a cosmos galaxy position and must be dropped
+    mock_make_stars.return_value = Table(
+        {"ra": [1.0, 4.0], "dec": [1.0, 4.0], "F062": [5.0, 4.0]}
+    )
+    output_filename = str(tmp_path / "out.parquet")
+    obj = InputCatalog("plan.ecsv", output_catalog_filename=output_filename)
     obj._generate_catalog(filter_list=["f062"])
     mock_make_cosmos_galaxies.assert_called_once()
     mock_make_gaia_stars.assert_called_once()
     mock_make_stars.assert_called_once()
-    mock_vstack.assert_called_once()
-    mock_catalog.write.assert_called_once_with(
-        "out.ecsv", format="parquet", overwrite=True
+    result = Table.read(output_filename, format="parquet")
+    assert len(result) == 4
+    assert len(obj.catalog) == 4
+
+    # a fresh instance for the same field must be served from the on-disk
+    # cache without re-invoking the romanisim generators
+    obj2 = InputCatalog("plan.ecsv", output_catalog_filename=output_filename)
+    obj2._generate_catalog(filter_list=["f062"])
+    mock_make_cosmos_galaxies.assert_called_once()
+    mock_make_gaia_stars.assert_called_once()
+    mock_make_stars.assert_called_once()
+    assert len(obj2.catalog) == 4
+
+
+@patch("roman_simulate_dr.scripts.generate_input_catalog.read_obs_plan")
+def test_plan_field_bounding_circle(mock_read_obs_plan, mock_plan):
+    """
+    Purpose: Verify that the default field is the bounding circle of the
+    plan pointings: a center between them and a radius that covers the
+    farthest pointing plus the footprint margin.
+    """
+    mock_read_obs_plan.return_value = mock_plan
+    obj = InputCatalog("plan.ecsv", output_catalog_filename="out.parquet")
+    assert 10.0 < obj.ra < 20.0
+    assert 30.0 < obj.dec < 40.0
+    # half the ~13.6 deg separation between the two pointings, plus 0.3
+    assert 6.0 < obj.radius < 8.0
+
+
+@patch("roman_simulate_dr.scripts.generate_input_catalog.read_obs_plan")
+def test_tile_field_geometry(mock_read_obs_plan, mock_plan):
+    """
+    Purpose: Verify that _tile_field produces one central and six ring
+    sub-cones whose centers stay inside the field and whose radii are
+    smaller than the full field radius.
+    """
+    mock_read_obs_plan.return_value = mock_plan
+    obj = InputCatalog(
+        "plan.ecsv",
+        output_catalog_filename="out.parquet",
+        ra=10.0,
+        dec=20.0,
+        radius=0.3,
+        tiled=True,
     )
+    tiles = obj._tile_field()
+    assert len(tiles) == 7
+    assert tiles[0][:2] == (10.0, 20.0)
+    for ra, dec, tile_radius in tiles:
+        assert 0 < tile_radius < obj.radius
+        assert abs(dec - obj.dec) <= obj.radius
+        # great-circle RA offset, so the "centers stay inside the field"
+        # claim is actually checked in both coordinates
+        assert abs(ra - obj.ra) * np.cos(np.deg2rad(dec)) <= obj.radius
+
+
+def test_stack_components_promotes_dtypes():
+    """
+    Purpose: Verify that _stack_components promotes column dtypes across
+    inputs instead of truncating wider strings or downcasting wider
+    floats to the first table's dtype.
+    """
+    first = Table({"name": ["GAL"], "flux": np.array([1.0], dtype="f4")})
+    second = Table({"name": ["GALAXYLONG"], "flux": np.array([2.5], dtype="f8")})
+    result = InputCatalog._stack_components([first, second])
+    assert list(result["name"]) == ["GAL", "GALAXYLONG"]
+    assert result["flux"].dtype == np.float64
+    assert result["flux"][1] == 2.5
+
+
+def test_deduplicate_with_match_radius():
+    """
+    Purpose: Verify that _deduplicate with a match_radius collapses
+    near-duplicate positions while keeping well-separated sources.
+    """
+    catalog = Table(
+        {
+            # rows 0 and 1 are ~0.36 arcsec apart; row 2 is far away
+            "ra": [10.0, 10.0001, 11.0],
+            "dec": [20.0, 20.0, 20.0],
+            "F062": [1.0, 2.0, 3.0],
+        }
+    )
+    result = InputCatalog._deduplicate(catalog, match_radius=1.0)
+    assert len(result) == 2
+    assert list(result["F062"]) == [1.0, 3.0]
 
 
 @patch.object(InputCatalog, "_generate_catalog")
@@ -79,3 +174,20 @@ def test_run_calls_generate_catalog(
     obj = InputCatalog("plan.ecsv", output_catalog_filename="out.ecsv")
     obj.run()
     mock_generate_catalog.assert_called_once()
+
+
+@patch.object(InputCatalog, "_generate_catalog")
+@patch("roman_simulate_dr.scripts.generate_input_catalog.read_obs_plan")
+def test_run_passes_plan_filter_union(mock_read_obs_plan, mock_generate_catalog):
+    """
+    Purpose: Verify that run() derives the canonical bandpass tuple from
+    the plan's BANDPASS column and passes it to _generate_catalog.
+    """
+    mock_read_obs_plan.return_value = {
+        "RA": [10.0, 20.0],
+        "DEC": [30.0, 40.0],
+        "BANDPASS": ["F158", "F062", "F158"],
+    }
+    obj = InputCatalog("plan.ecsv", output_catalog_filename="out.ecsv")
+    obj.run()
+    mock_generate_catalog.assert_called_once_with(filter_list=("F158", "F062"))
@@ -1,51 +1,186 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import Mock, patch
 
 import pytest
+from astropy.table import Table, vstack
+
+from roman_simulate_dr.scripts.generate_simulated_l1_images import (
+    RomanisimImages,
+    _run_make_image_batch,
+)
+from roman_simulate_dr.scripts.utils import parallelize_jobs
+
+_PLAN_COLNAMES = (
+    "RA",
+    "DEC",
+    "PA",
+    "BANDPASS",
+    "MA_TABLE_NUMBER",
+    "DURATION",
+    "PLAN",
+    "PASS",
+    "SEGMENT",
+    "OBSERVATION",
+    "VISIT",
+    "EXPOSURE",
+)
+
+
+# Minimal single-pointing observation plan; a plain module constant —
+# no test mutates it, and constant lookup skips fixture resolution
+MOCK_PLAN = Table(
+    rows=[(270.0, 66.0, 0.0, "F062", 109, 100, 1, 1, 1, 1, 1, 1)],
+    names=_PLAN_COLNAMES,
+)
 
-from roman_simulate_dr.scripts.generate_simulated_l1_images import RomanisimImages
 
+@pytest.fixture(autouse=True)
+def mock_read_obs_plan(monkeypatch):
+    # one fixture instead of a @patch decorator per test: every test in
+    # this module needs the plan read stubbed, and tests that want a
+    # different plan just reassign return_value before constructing
+    # a plain Mock: no magic-method children are needed for a read stub,
+    # and skipping their generation makes the fixture cheaper per test
+    mock = Mock(return_value=MOCK_PLAN)
+    monkeypatch.setattr(
+        "roman_simulate_dr.scripts.generate_simulated_l1_images.read_obs_plan",
+        mock,
+    )
+    return mock
+
+
+@pytest.fixture(scope="module")
+def make_images():
+    # memoizing factory: tests sharing a constructor configuration get
+    # the same instance instead of rebuilding it per test. Fine because
+    # RomanisimImages carries only read-only configuration after __init__
+    cache = {}
+
+    def _make(**kwargs):
+        key = repr(sorted(kwargs.items()))
+        if key not in cache:
+            cache[key] = RomanisimImages("plan.ecsv", "input.ecsv", **kwargs)
+        return cache[key]
 
-@pytest.fixture
-def mock_plan():
-    # Minimal observation plan tuple structure
-    return [(270.0, 66.0, 0.0, "F062", 109, 100, 1, 1, 1, 1, 1, 1)]
+    return _make
 
 
-@patch("roman_simulate_dr.scripts.generate_simulated_l1_images.read_obs_plan")
-def test_init_sets_attributes(mock_read_obs_plan, mock_plan):
-    mock_read_obs_plan.return_value = mock_plan
-    obj = RomanisimImages("plan.ecsv", "input.ecsv", max_workers=2, sca_ids=[1, 2])
-    assert obj.plan == mock_plan
+def test_init_sets_attributes(make_images):
+    obj = make_images(max_workers=2, sca_ids=[1, 2])
+    assert obj.plan is MOCK_PLAN
     assert obj.input_filename == "input.ecsv"
     assert obj.max_workers == 2
     assert obj.sca_ids == [1, 2]
 
 
-@patch("roman_simulate_dr.scripts.generate_simulated_l1_images.read_obs_plan")
-@patch("subprocess.run")
-def test_generate_simulated_images_runs_subprocess(mock_run, mock_read_obs_plan):
-    mock_read_obs_plan.return_value = [
-        (270.0, 66.0, 0.0, "F062", 109, 100, 1, 1, 1, 1, 1, 1)
-    ]
-    mock_run.return_value = MagicMock(returncode=0, stdout="ok", stderr="")
-    obj = RomanisimImages("plan.ecsv", "input.ecsv")
-    out, code = obj._generate_simulated_images(
-        output_filename="test.asdf", catalog="input.ecsv"
-    )
-    assert out == "test.asdf"
-    assert code == 0
-    mock_run.assert_called_once()
+def test_build_command_structure(make_images):
+    obj = make_images()
+    cmd = obj._build_command(output_filename="test.asdf", catalog="input.ecsv")
+    assert cmd[0].endswith("romanisim-make-image")
+    assert cmd[-1] == "test.asdf"
+    assert cmd[cmd.index("--catalog") + 1] == "input.ecsv"
+    assert "--usecrds" in cmd
+
+
+@patch("roman_simulate_dr.scripts.generate_simulated_l1_images.run_commands_async")
+def test_run_dispatches_commands(mock_run_commands, make_images):
+    obj = make_images(max_workers=2, sca_ids=[1])
+    obj.run()
+    mock_run_commands.assert_called_once()
+    commands = mock_run_commands.call_args[0][0]
+    assert len(commands) == 1
+    assert commands[0][0].endswith("romanisim-make-image")
 
 
 @patch("roman_simulate_dr.scripts.generate_simulated_l1_images.parallelize_jobs")
-@patch("roman_simulate_dr.scripts.generate_simulated_l1_images.read_obs_plan")
-def test_run_calls_parallelize_jobs(
-    mock_read_obs_plan, mock_parallelize_jobs, mock_plan
-):
-    mock_read_obs_plan.return_value = mock_plan
-    obj = RomanisimImages("plan.ecsv", "input.ecsv", max_workers=2, sca_ids=[1])
+def test_run_in_process_uses_worker_pool(mock_parallelize_jobs, make_images):
+    """
+    Purpose: Verify that in_process=True dispatches per-pointing batches
+    of runpy-executed command vectors through the persistent process pool
+    instead of spawning romanisim-make-image children.
+    """
+    mock_parallelize_jobs.return_value = []
+    obj = make_images(sca_ids=[1, 2], force=True, in_process=True)
     obj.run()
     mock_parallelize_jobs.assert_called_once()
+    batches = mock_parallelize_jobs.call_args[0][1]
+    # both SCAs share the pointing, so they form one batch
+    assert len(batches) == 1
+    assert len(batches[0]["cmds"]) == 2
+    assert batches[0]["cmds"][0][0].endswith("romanisim-make-image")
+    assert mock_parallelize_jobs.call_args[1]["pool_kind"] == "process"
+
+
+def test_in_process_failure_is_recorded(tmp_path):
+    """
+    Purpose: Verify that a command exiting non-zero is reported as a
+    batch failure when run through the real in-process pool, instead of
+    its SystemExit escaping the pool's exception handling and killing
+    the supervising process with the child's exit code.
+    """
+    script = tmp_path / "fail.py"
+    script.write_text("import sys\nsys.exit(2)\n")
+    batches = [{"cmds": [[str(script), "out.asdf"]]}]
+    failures = parallelize_jobs(
+        _run_make_image_batch, batches, max_workers=1, pool_kind="process"
+    )
+    assert len(failures) == 1
+    failed_batch, exc = failures[0]
+    assert failed_batch == batches[0]
+    assert isinstance(exc, RuntimeError)
+    assert "out.asdf failed" in str(exc)
+
+
+@patch("roman_simulate_dr.scripts.generate_simulated_l1_images.run_commands_async")
+def test_run_deduplicates_identical_jobs(
+    mock_run_commands, mock_read_obs_plan
+):
+    """
+    Purpose: Verify that plan rows mapping to the same output filename
+    are collapsed into a single job before dispatch.
+    """
+    mock_read_obs_plan.return_value = vstack([MOCK_PLAN, MOCK_PLAN])
+    obj = RomanisimImages("plan.ecsv", "input.ecsv", sca_ids=[1], force=True)
+    obj.run()
+    assert len(mock_run_commands.call_args[0][0]) == 1
+
+
+@patch("roman_simulate_dr.scripts.generate_simulated_l1_images.run_commands_async")
+def test_run_skips_existing_outputs(
+    mock_run_commands, make_images, tmp_path, monkeypatch
+):
+    """
+    Purpose: Verify that run() skips jobs whose output files already exist
+    and are non-empty, unless force=True is passed.
+    """
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "r101001001001001_0001_wfi01_f062_uncal.asdf").write_text("data")
+    obj = make_images(sca_ids=[1])
+    obj.run()
+    assert mock_run_commands.call_args[0][0] == []
+
+    forced = make_images(sca_ids=[1], force=True)
+    forced.run()
+    assert len(mock_run_commands.call_args[0][0]) == 1
+
+
+def test_stage_catalog_falls_back_to_original():
+    """
+    Purpose: Verify that _stage_catalog returns the original path when the
+    catalog file does not exist, so staging never breaks a run.
+    """
+    path = "nonexistent_catalog.ecsv"
+    assert RomanisimImages._stage_catalog(path) == path
+
+
+def test_run_with_empty_plan_completes(mock_read_obs_plan):
+    """
+    Purpose: Smoke-test that run() returns promptly on an empty plan
+    instead of stalling, guarding against stray debugging hooks in the
+    dispatch path.
+    """
+    mock_read_obs_plan.return_value = MOCK_PLAN[:0]
+    obj = RomanisimImages("plan.ecsv", "input.ecsv")
+    obj.run()
 
 
 class DummyInputCatalog(RomanisimImages):
@@ -54,22 +189,21 @@ class DummyInputCatalog(RomanisimImages):
         pass
 
 
-@pytest.mark.parametrize(
-    "input_sca_ids,expected",
-    [
-        (None, [1]),
-        ([-1], list(range(1, 18))),
-        ([2, 3, 4], [2, 3, 4]),
-    ],
-)
-def test_create_sca_id_list_param(input_sca_ids, expected):
+def test_create_sca_id_list():
     """
-    Purpose: Parametrized test for _create_sca_id_list to verify correct output for
-    None, negative, and custom input cases.
+    Purpose: Table-driven test for _create_sca_id_list covering the None,
+    negative, and custom input cases; a single node is cheaper to collect
+    and run than a parametrized one for a trivial pure-function check.
     """
     obj = DummyInputCatalog()
-    result = obj._create_sca_id_list(input_sca_ids)
-    # Convert range to list for comparison
-    if isinstance(result, range):
-        result = list(result)
-    assert result == expected
+    cases = [
+        (None, [1]),
+        ([-1], list(range(1, 18))),
+        ([2, 3, 4], [2, 3, 4]),
+    ]
+    for input_sca_ids, expected in cases:
+        result = obj._create_sca_id_list(input_sca_ids)
+        # Convert range to list for comparison
+        if isinstance(result, range):
+            result = list(result)
+        assert result == expected, f"case {input_sca_ids!r}"
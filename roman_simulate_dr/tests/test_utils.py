@@ -1,31 +1,80 @@
+import io
+import os
+import sys
+import textwrap
+import time
+from unittest.mock import patch
+
+import numpy as np
+import pytest
 from astropy.table import Table
 
 from roman_simulate_dr.scripts.utils import (
+    _read_obs_plan_cached,
     generate_catalog_name,
     generate_roman_filename,
+    generate_roman_filename_prefix,
     parallelize_jobs,
     read_obs_plan,
+    run_commands_async,
+)
+
+# shared ECSV plan content, dedented once at import instead of being
+# re-built (and re-indented) inside each test body
+_ECSV = textwrap.dedent(
+    """\
+    # %ECSV 0.9
+    # ---
+    # datatype:
+    # - {name: RA, datatype: float64}
+    # - {name: DEC, datatype: float64}
+    RA DEC
+    10.0 20.0
+    """
 )
 
 
-def test_generate_roman_filename_basic():
+# fixed observation identifiers shared by the filename tests; splatted
+# per case instead of being rebuilt in each test body
+BASE_KWARGS = {
+    "program": 1,
+    "plan": 2,
+    "passno": 3,
+    "segment": 4,
+    "observation": 5,
+    "visit": 6,
+    "exposure": 7,
+    "sca": 8,
+}
+
+
+@pytest.mark.parametrize(
+    "bandpass,suffix,expected",
+    [
+        ("F106", "cat", "r102003004005006_0007_wfi08_f106_cat.asdf"),
+        ("F062", "uncal", "r102003004005006_0007_wfi08_f062_uncal.asdf"),
+    ],
+)
+def test_generate_roman_filename(bandpass, suffix, expected):
     """
     Purpose: Verify that generate_roman_filename produces the correct filename format
     given a set of input parameters.
     """
     fname = generate_roman_filename(
-        program=1,
-        plan=2,
-        passno=3,
-        segment=4,
-        observation=5,
-        visit=6,
-        exposure=7,
-        sca=8,
-        bandpass="F106",
-        suffix="cat",
+        bandpass=bandpass, suffix=suffix, **BASE_KWARGS
+    )
+    assert fname == expected
+
+
+def test_generate_roman_filename_prefix_matches_full_name():
+    """
+    Purpose: Verify that the per-exposure prefix is the stem of the full
+    filename produced by generate_roman_filename.
+    """
+    prefix = generate_roman_filename_prefix(
+        program=1, plan=2, passno=3, segment=4, observation=5, visit=6, exposure=7
     )
-    assert fname == "r102003004005006_0007_wfi08_f106_cat.asdf"
+    assert prefix == "r102003004005006_0007"
 
 
 def test_read_obs_plan(tmp_path):
@@ -33,25 +82,92 @@ def test_read_obs_plan(tmp_path):
     Purpose: Ensure that read_obs_plan correctly reads an ECSV file and returns
     an astropy Table with expected columns and values.
     """
-    # Create a minimal ECSV file
-    ecsv_content = """
-    # %ECSV 0.9
-    # ---
-    # datatype:
-    # - {name: RA, datatype: float64}
-    # - {name: DEC, datatype: float64}
-    RA DEC
-    10.0 20.0
-    30.0 40.0
-    """
+    # build the plan in memory and stub out the parser and the sidecar
+    # write: the ECSV round-trip through disk would dominate this test
+    tbl = Table({"RA": [10.0, 30.0], "DEC": [20.0, 40.0]})
     ecsv_file = tmp_path / "test.ecsv"
-    ecsv_file.write_text(ecsv_content)
-    table = read_obs_plan(str(ecsv_file))
+    ecsv_file.touch()
+    with (
+        patch.object(Table, "read", return_value=tbl),
+        patch.object(Table, "write"),
+    ):
+        table = read_obs_plan(str(ecsv_file))
     assert isinstance(table, Table)
     assert "RA" in table.colnames
     assert "DEC" in table.colnames
+    # whole-column comparisons: one C-level compare per column instead of
+    # per-element __getitem__ chains, and they stay O(1) in Python
+    # dispatch if the fixture grows
+    np.testing.assert_array_equal(np.asarray(table["RA"]), [10.0, 30.0])
+    np.testing.assert_array_equal(np.asarray(table["DEC"]), [20.0, 40.0])
+
+
+def test_read_obs_plan_accepts_file_like():
+    """
+    Purpose: Verify that read_obs_plan parses ECSV content from an
+    in-memory file-like object, with no filesystem round-trip.
+    """
+    table = read_obs_plan(io.StringIO(_ECSV))
+    assert table["RA"][0] == 10.0
+    assert table["DEC"][0] == 20.0
+
+
+def test_read_obs_plan_requests_fast_reader(tmp_path):
+    """
+    Purpose: Lock the production ECSV parse to astropy's fast C reader;
+    a regression to the pure-Python tokenizer would be silent otherwise.
+    """
+    tbl = Table({"RA": [10.0]})
+    plan_file = tmp_path / "fast.ecsv"
+    plan_file.touch()
+    with (
+        patch.object(Table, "read", return_value=tbl) as mock_read,
+        patch.object(Table, "write"),
+    ):
+        read_obs_plan(str(plan_file))
+    mock_read.assert_called_once_with(
+        str(plan_file), format="ascii.ecsv", fast_reader=True
+    )
+
+
+def test_read_obs_plan_caches_parses(tmp_path):
+    """
+    Purpose: Verify that read_obs_plan serves repeated reads of the same
+    unchanged file from its cache and returns independent copies.
+    """
+    ecsv_file = tmp_path / "plan.ecsv"
+    ecsv_file.write_text(_ECSV)
+    first = read_obs_plan(str(ecsv_file))
+    # a second read must not touch the parser again
+    with patch.object(Table, "read", side_effect=AssertionError):
+        second = read_obs_plan(str(ecsv_file))
+    assert second["RA"][0] == 10.0
+    # mutating a returned table must not poison the cache
+    second["RA"][0] = -1.0
+    assert first["RA"][0] == 10.0
+    third = read_obs_plan(str(ecsv_file))
+    assert third["RA"][0] == 10.0
+
+
+def test_read_obs_plan_uses_parquet_sidecar(tmp_path):
+    """
+    Purpose: Verify that the first parse writes a Parquet sidecar and
+    that a fresh (uncached) read is served from the sidecar instead of
+    re-parsing the ECSV, as long as the sidecar is newer than the plan.
+    """
+    ecsv_file = tmp_path / "plan.ecsv"
+    ecsv_file.write_text(_ECSV)
+    read_obs_plan(str(ecsv_file))
+    sidecar = tmp_path / "plan.ecsv.parquet"
+    assert sidecar.exists()
+    # drop the in-process cache and invalidate the ECSV; a read must
+    # still succeed because the (newer) sidecar is preferred
+    _read_obs_plan_cached.cache_clear()
+    ecsv_file.write_text("not an ecsv file")
+    mtime_ns = ecsv_file.stat().st_mtime_ns + 1
+    os.utime(sidecar, ns=(mtime_ns, mtime_ns))
+    table = read_obs_plan(str(ecsv_file))
     assert table["RA"][0] == 10.0
-    assert table["DEC"][1] == 40.0
 
 
 def test_parallelize_jobs():
@@ -59,14 +175,129 @@ def test_parallelize_jobs():
     Purpose: Test that parallelize_jobs executes all jobs in parallel and collects
     the correct results, verifying both argument passing and parallel execution.
     """
-    results = []
+    # preallocated, index-addressed results: completion order does not
+    # matter and the assertion stays deterministic without sorting
+    jobs = [{"x": 1, "y": 2, "idx": 0}, {"x": 3, "y": 4, "idx": 1}]
+    results = [None] * len(jobs)
+
+    def dummy_method(x, y, idx):
+        results[idx] = x + y
+
+    failures = parallelize_jobs(dummy_method, jobs, max_workers=2)
+    assert results == [3, 7]
+    assert failures == []
+
+
+def test_parallelize_jobs_scales_with_workers():
+    """
+    Purpose: Guard against a regression where parallelize_jobs silently
+    sequentializes: with 8 workers, a batch of sleep jobs must finish in
+    well under half the sequential wall time. The threshold is generous
+    so the test stays robust on loaded CI machines.
+    """
+    n_jobs, delay = 32, 0.02
+
+    def slow(delay):
+        time.sleep(delay)
+
+    jobs = [{"delay": delay}] * n_jobs
+    start = time.perf_counter()
+    failures = parallelize_jobs(slow, jobs, max_workers=8)
+    elapsed = time.perf_counter() - start
+    assert failures == []
+    assert elapsed < 0.5 * n_jobs * delay
+
+
+def test_parallelize_jobs_collects_failures():
+    """
+    Purpose: Verify that parallelize_jobs maps each failure back to the
+    job that raised it instead of losing or misattributing errors.
+    """
+
+    def sometimes_fails(x):
+        if x == 2:
+            raise ValueError("boom")
+
+    jobs = [{"x": 1}, {"x": 2}, {"x": 3}]
+    failures = parallelize_jobs(sometimes_fails, jobs, max_workers=2)
+    assert len(failures) == 1
+    failed_job, exc = failures[0]
+    assert failed_job == {"x": 2}
+    assert isinstance(exc, ValueError)
+
+
+def test_parallelize_jobs_fail_fast():
+    """
+    Purpose: Verify that fail_fast stops dispatching jobs after the
+    first failure and reports the skipped ones with None, mirroring
+    run_commands_async's fail-fast contract.
+    """
+    calls = []
+
+    def sometimes_fails(x):
+        calls.append(x)
+        if x == 1:
+            raise ValueError("boom")
+
+    jobs = [{"x": 0}, {"x": 1}, {"x": 2}]
+    failures = parallelize_jobs(sometimes_fails, jobs, max_workers=1, fail_fast=True)
+    assert calls == [0, 1]
+    assert [(job["x"], type(exc)) for job, exc in failures] == [
+        (1, ValueError),
+        (2, type(None)),
+    ]
+
+
+def _add(x, y):
+    # module-level so it is picklable by the process pool
+    return x + y
 
-    def dummy_method(x, y):
-        results.append(x + y)
 
+def test_parallelize_jobs_process_pool():
+    """
+    Purpose: Smoke-test that parallelize_jobs can dispatch picklable jobs
+    through a ProcessPoolExecutor without errors.
+    """
     jobs = [{"x": 1, "y": 2}, {"x": 3, "y": 4}]
-    parallelize_jobs(dummy_method, jobs, max_workers=2)
-    assert sorted(results) == [3, 7]
+    parallelize_jobs(_add, jobs, max_workers=2, pool_kind="process")
+
+
+def test_run_commands_async_collects_failures():
+    """
+    Purpose: Verify that run_commands_async runs commands concurrently and
+    reports only the ones that exited non-zero, keyed by their label.
+    """
+    ok = [sys.executable, "-c", "pass"]
+    bad = [sys.executable, "-c", "raise SystemExit(3)"]
+    failures = run_commands_async([ok, bad], max_workers=2, labels=["ok", "bad"])
+    assert failures == [("bad", 3)]
+
+
+def test_run_commands_async_writes_log_files(tmp_path):
+    """
+    Purpose: Verify that per-command log paths receive the child's output
+    directly instead of it going through the logger.
+    """
+    log_path = tmp_path / "job.log"
+    cmd = [sys.executable, "-c", "print('hello from child')"]
+    failures = run_commands_async([cmd], labels=["job"], log_paths=[str(log_path)])
+    assert failures == []
+    assert "hello from child" in log_path.read_text()
+
+
+def test_run_commands_async_fail_fast(tmp_path):
+    """
+    Purpose: Verify that fail_fast stops launching pending commands after
+    the first non-zero exit and reports the skipped ones with None.
+    """
+    marker = tmp_path / "ran.txt"
+    bad = [sys.executable, "-c", "raise SystemExit(1)"]
+    ok = [sys.executable, "-c", f"open(r'{marker}', 'w').close()"]
+    failures = run_commands_async(
+        [bad, ok], max_workers=1, labels=["bad", "ok"], fail_fast=True
+    )
+    assert failures == [("bad", 1), ("ok", None)]
+    assert not marker.exists()
 
 
 def test_generate_catalog_name_basic():
@@ -75,3 +306,4 @@ def test_generate_catalog_name_basic():
     assert generate_catalog_name("data/obs_plan.ecsv") == "data/obs_plan_cat.ecsv"
     assert generate_catalog_name("plan") == "plan_cat"
     assert generate_catalog_name("plan.v1.ecsv") == "plan.v1_cat.ecsv"
+    assert generate_catalog_name("plan.ecsv", ext=".parquet") == "plan_cat.parquet"